@@ -0,0 +1,163 @@
+"""
+Numeric kernels used by compute_metrics.py
+
+Kernels are JIT-compiled with numba when it is installed, so numba stays an
+optional dependency. Without it, kernels that have a vectorized NumPy
+equivalent use that instead and the rest run as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function interpreted."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def _fenwick_add(tree, index, delta):
+    """Add delta at 0-based index of a Fenwick tree."""
+    index += 1
+    while index < tree.size:
+        tree[index] += delta
+        index += index & -index
+
+
+@njit(cache=True, nogil=True)
+def _fenwick_prefix(tree, index):
+    """Return the sum of a Fenwick tree over 0-based indices [0, index)."""
+    total = 0
+    while index > 0:
+        total += tree[index]
+        index -= index & -index
+    return total
+
+
+@njit(cache=True, nogil=True)
+def _update_window(j, sign, ranks, ratings, like_tree, dislike_tree, state):
+    """Add (sign=1) or remove (sign=-1) sample j from the rolling window state."""
+    # state = [likes, dislikes, ranked_likes, correct]
+    rank = ranks[j]
+    if ratings[j] == 1.0:
+        state[0] += sign
+        if rank >= 0:
+            # Pairs with every ranked dislike strictly below this like
+            state[3] += sign * _fenwick_prefix(dislike_tree, rank)
+            _fenwick_add(like_tree, rank, sign)
+            state[2] += sign
+    elif ratings[j] == 0.0:
+        state[1] += sign
+        if rank >= 0:
+            # Pairs with every ranked like strictly above this dislike
+            state[3] += sign * (state[2] - _fenwick_prefix(like_tree, rank + 1))
+            _fenwick_add(dislike_tree, rank, sign)
+
+
+@njit(cache=True, nogil=True)
+def rolling_u(ranks, ratings, window, min_samples, out):
+    """
+    Write the rolling pairwise agreement of each window ending at i into out[i].
+
+    ranks holds the dense rank of each prediction (-1 for NaN, which is never
+    counted as correct). Windows shorter than min_samples or without a
+    (liked, disliked) pair are left untouched.
+    """
+    n = ranks.size
+    like_tree = np.zeros(n + 1, dtype=np.int64)
+    dislike_tree = np.zeros(n + 1, dtype=np.int64)
+    state = np.zeros(4, dtype=np.int64)
+
+    for i in range(n):
+        if i >= window:
+            _update_window(i - window, -1, ranks, ratings, like_tree, dislike_tree, state)
+        _update_window(i, 1, ranks, ratings, like_tree, dislike_tree, state)
+
+        if min(i + 1, window) < min_samples:
+            continue
+
+        total = state[0] * state[1]
+        if total > 0:
+            out[i] = state[3] / total
+
+
+@njit(cache=True, nogil=True)
+def _summarize_spans_loop(error, ratings, n):
+    """
+    Accumulate likes, error sums and error counts over the first n, last n and
+    all samples in a single pass. Each result array is indexed [first, last, total];
+    NaN errors are left out of the sums and counts.
+    """
+    size = ratings.size
+    likes = np.zeros(3, dtype=np.int64)
+    error_sums = np.zeros(3, dtype=np.float64)
+    error_counts = np.zeros(3, dtype=np.int64)
+
+    for i in range(size):
+        like = ratings[i] == 1.0
+        valid = not np.isnan(error[i])
+        for span in range(3):
+            if span == 0 and i >= n:
+                continue
+            if span == 1 and i < size - n:
+                continue
+            if like:
+                likes[span] += 1
+            if valid:
+                error_sums[span] += error[i]
+                error_counts[span] += 1
+
+    return likes, error_sums, error_counts
+
+
+def _summarize_spans_numpy(error, ratings, n):
+    """NumPy version of _summarize_spans_loop: three reductions per span instead of one pass."""
+    size = ratings.size
+    spans = [slice(0, n), slice(size - n, size), slice(0, size)]
+    likes = np.array([np.count_nonzero(ratings[s] == 1.0) for s in spans], dtype=np.int64)
+    error_sums = np.array([np.nansum(error[s], dtype=np.float64) for s in spans])
+    error_counts = np.array([np.count_nonzero(~np.isnan(error[s])) for s in spans], dtype=np.int64)
+    return likes, error_sums, error_counts
+
+
+# The fused loop only pays off compiled; interpreted it is far slower than NumPy
+summarize_spans = _summarize_spans_loop if HAVE_NUMBA else _summarize_spans_numpy
+
+
+@njit(cache=True, nogil=True)
+def _rolling_mean_loop(x, window, out):
+    """
+    Write the mean of the window ending at i into out[i], from a running sum.
+    Matches pandas' rolling(window, min_periods=1).mean(): NaNs are skipped and
+    a window with no valid values is NaN.
+    """
+    total = 0.0
+    count = 0
+    for i in range(x.size):
+        if not np.isnan(x[i]):
+            total += x[i]
+            count += 1
+        if i >= window and not np.isnan(x[i - window]):
+            total -= x[i - window]
+            count -= 1
+        out[i] = total / count if count > 0 else np.nan
+
+
+def _rolling_mean_numpy(x, window, out):
+    """NumPy version of _rolling_mean_loop: window sums as differences of cumulative sums."""
+    valid = ~np.isnan(x)
+    sums = np.cumsum(np.where(valid, x, 0), dtype=np.float64)
+    counts = np.cumsum(valid, dtype=np.int64)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    out[:] = np.nan
+    np.divide(sums, counts, out=out, where=counts > 0)
+
+
+rolling_mean_stream = _rolling_mean_loop if HAVE_NUMBA else _rolling_mean_numpy
@@ -9,174 +9,409 @@ Metrics computed:
 4. Rolling prediction error - Mean |prediction - rating| over sliding window
 
 Supports both old (mlpPrediction) and new (mlpGenomePrediction, mlpAudioPrediction) column formats.
+Rolling kernels live in _kernels.py and are JIT-compiled when numba is installed.
+matplotlib is only imported when charts are drawn, and the kernels (and numba) when first used.
 """
 
 import argparse
+import importlib.util
+import os
+import sys
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from collections.abc import Container, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from itertools import product
 
 
 DEFAULT_CSV = Path.home() / "Library/Application Support/PresetPreferenceGenerator/feedback_dataset.csv"
 
+# Columns the metrics read; genome parameters, timestamps etc. are never loaded
+PREDICTION_COLUMNS = ['mlpGenomePrediction', 'mlpAudioPrediction', 'mlpPrediction']
+USED_COLUMNS = ['rating', 'sampleIndex', *PREDICTION_COLUMNS, 'configFlags']
 
-def load_data(csv_path: Path) -> pd.DataFrame:
-    """Load and validate the feedback CSV."""
-    if not csv_path.exists():
-        raise FileNotFoundError(f"CSV not found: {csv_path}")
-    
-    df = pd.read_csv(csv_path)
+# Ratings and predictions are in [0, 1] and sample indices are small, so
+# 32-bit types are plenty and halve the memory traffic of every metric
+COLUMN_DTYPES = {'rating': np.float32, 'sampleIndex': np.int32, **{c: np.float32 for c in PREDICTION_COLUMNS}}
+
+# Files at least this large are summarised chunk by chunk when no charts are needed
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+STREAMING_CHUNK_ROWS = 1_000_000
+
+# Predictions are sigmoid outputs written with six decimals, so counting them
+# in bins of width 1e-6 over [0, 1] ranks them exactly; files that break this
+# are not streamed (see _on_prediction_grid)
+PREDICTION_BINS = 1_000_001
+
+# Display names and chart colors per prediction column
+_LABELS = {'mlpGenomePrediction': 'Genome MLP', 'mlpAudioPrediction': 'Audio MLP', 'mlpPrediction': 'MLP'}
+_SHORT_LABELS = {'mlpGenomePrediction': 'Genome', 'mlpAudioPrediction': 'Audio', 'mlpPrediction': 'MLP'}
+_COLORS = {'mlpGenomePrediction': '#2563eb', 'mlpAudioPrediction': '#dc2626', 'mlpPrediction': '#2563eb'}
+
+# Charts are for screen/slides; more points than this are thinned before plotting
+CHART_DPI = 100
+MAX_CHART_POINTS = 2000
+
+
+_FIGURE = None
+_AXES = None
+
+
+def _get_axes():
+    """Return the shared (figure, axes) used for every chart, cleared for reuse."""
+    global _FIGURE, _AXES
+    if _FIGURE is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _FIGURE, _AXES = plt.subplots(figsize=(10, 5))
+    _AXES.clear()
+    return _FIGURE, _AXES
+
+
+def _chart_step(n: int) -> int:
+    """Return the stride that keeps an n-point series within MAX_CHART_POINTS."""
+    return max(1, -(-n // MAX_CHART_POINTS))
+
+
+def _load_kernels():
+    """
+    Import the _kernels.py next to this file, whether it runs as a script or as
+    analysis.compute_metrics. The module is always named _kernels, since numba's
+    on-disk cache is shared by both invocations and records the module name.
+    """
+    kernels = sys.modules.get('_kernels')
+    if kernels is None:
+        spec = importlib.util.spec_from_file_location('_kernels', Path(__file__).with_name('_kernels.py'))
+        kernels = importlib.util.module_from_spec(spec)
+        sys.modules['_kernels'] = kernels
+        spec.loader.exec_module(kernels)
+    return kernels
+
+
+def _csv_engine() -> str:
+    """Return the fastest available pandas CSV engine."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'c'
+    return 'pyarrow'
+
+
+def _read_options(csv_path: Path) -> tuple[list[str], dict]:
+    """Validate the CSV header and return the usecols/dtype arguments for reading it."""
+    # The pyarrow engine is much faster but cannot take a callable usecols,
+    # so intersect with the header up front
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [c for c in header if c in USED_COLUMNS]
     
     required = ['rating', 'sampleIndex']
-    missing = [c for c in required if c not in df.columns]
+    missing = [c for c in required if c not in usecols]
     if missing:
         raise ValueError(f"Missing columns: {missing}")
     
     # Handle column name compatibility
-    has_dual = 'mlpGenomePrediction' in df.columns and 'mlpAudioPrediction' in df.columns
-    has_legacy = 'mlpPrediction' in df.columns
+    has_dual = 'mlpGenomePrediction' in usecols and 'mlpAudioPrediction' in usecols
+    has_legacy = 'mlpPrediction' in usecols
     
     if not has_dual and not has_legacy:
         raise ValueError("Missing prediction columns: need either 'mlpPrediction' or 'mlpGenomePrediction'/'mlpAudioPrediction'")
     
+    dtype = {c: t for c, t in COLUMN_DTYPES.items() if c in usecols}
+    return usecols, dtype
+
+
+def load_data(csv_path: Path) -> pd.DataFrame:
+    """Load and validate the feedback CSV."""
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV not found: {csv_path}")
+    
+    usecols, dtype = _read_options(csv_path)
+    df = pd.read_csv(csv_path, usecols=usecols, dtype=dtype, engine=_csv_engine())
+    
+    # Few distinct configs, so config filters compare integer codes instead of strings
+    if 'configFlags' in df.columns:
+        df['configFlags'] = df['configFlags'].astype('category')
+    
     return df
 
 
-def get_prediction_columns(df: pd.DataFrame) -> list[str]:
-    """Return list of available prediction column names."""
+def iter_chunks(csv_path: Path, chunksize: int = STREAMING_CHUNK_ROWS) -> Iterator[dict[str, np.ndarray]]:
+    """Yield the used columns of the feedback CSV as NumPy arrays, chunksize rows at a time."""
+    usecols, dtype = _read_options(csv_path)
+    # The pyarrow engine cannot read in chunks, so this uses the default engine
+    with pd.read_csv(csv_path, usecols=usecols, dtype=dtype, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield {c: chunk[c].to_numpy() for c in chunk.columns}
+
+
+def select_prediction_columns(pred_cols: list[str], input_mode: str) -> list[str]:
+    """Filter prediction columns based on --input-mode."""
+    if input_mode == 'genome':
+        return [c for c in pred_cols if 'Genome' in c or c == 'mlpPrediction']
+    if input_mode == 'audio':
+        return [c for c in pred_cols if 'Audio' in c]
+    return pred_cols
+
+
+def get_prediction_columns(columns: Container[str]) -> list[str]:
+    """Return list of available prediction column names among columns."""
     cols = []
-    if 'mlpGenomePrediction' in df.columns:
+    if 'mlpGenomePrediction' in columns:
         cols.append('mlpGenomePrediction')
-    if 'mlpAudioPrediction' in df.columns:
+    if 'mlpAudioPrediction' in columns:
         cols.append('mlpAudioPrediction')
-    if 'mlpPrediction' in df.columns and not cols:
+    if 'mlpPrediction' in columns and not cols:
         cols.append('mlpPrediction')
     return cols
 
 
-def time_to_first_like(df: pd.DataFrame) -> int | None:
+def compute_errors(ratings: np.ndarray, predictions: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Return |prediction - rating| for each prediction column as float32 arrays."""
+    errors = {}
+    for col, preds in predictions.items():
+        error = np.empty(len(ratings), dtype=np.float32)
+        np.subtract(preds, ratings, out=error, casting='same_kind')
+        np.abs(error, out=error)
+        errors[col] = error
+    return errors
+
+
+class FeedbackView:
+    """
+    NumPy view of the feedback columns used by the metrics.
+    Samples are expected in sampleIndex order (main sorts the frame on load).
+    
+    The rating column is scanned once for like/dislike positions, which every
+    metric then reuses instead of rebuilding boolean masks and sub-DataFrames.
+    Per-column prediction errors are likewise computed once and shared.
+    """
+    
+    def __init__(self, ratings: np.ndarray, sample_index: np.ndarray, predictions: dict[str, np.ndarray]):
+        self.ratings = ratings
+        self.sample_index = sample_index
+        self.predictions = predictions
+        self.pred_cols = get_prediction_columns(predictions)
+        self.errors = compute_errors(ratings, predictions)
+        self.likes_idx = np.flatnonzero(ratings == 1.0)
+        self.dislikes_idx = np.flatnonzero(ratings == 0.0)
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'FeedbackView':
+        """Build a view of the rating, sampleIndex and prediction columns of df."""
+        predictions = {c: df[c].to_numpy(np.float32) for c in PREDICTION_COLUMNS if c in df.columns}
+        return cls(df['rating'].to_numpy(np.float32), df['sampleIndex'].to_numpy(np.int32), predictions)
+    
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+
+def time_to_first_like(view: FeedbackView) -> int | None:
     """Return sampleIndex of first like, or None if no likes."""
-    likes = df[df['rating'] == 1.0]
-    if likes.empty:
+    if view.likes_idx.size == 0:
         return None
-    return int(likes['sampleIndex'].min())
+    # Samples are in sampleIndex order, so the first like has the lowest index
+    return int(view.sample_index[view.likes_idx[0]])
 
 
-def like_rate(df: pd.DataFrame) -> tuple[int, int, float]:
+def like_rate(view: FeedbackView) -> tuple[int, int, float]:
     """Return (like_count, total_count, rate)."""
-    likes = int((df['rating'] == 1.0).sum())
-    total = len(df)
+    likes = view.likes_idx.size
+    total = len(view)
     rate = likes / total if total > 0 else 0.0
     return likes, total, rate
 
 
-def pairwise_agreement(df: pd.DataFrame, pred_col: str) -> tuple[int, int, float]:
+def pairwise_agreement(view: FeedbackView, pred_col: str) -> tuple[int, int, float]:
     """
     Return (correct_pairs, total_pairs, rate).
     For all (liked, disliked) pairs, check if MLP predicted liked > disliked.
+    This is the Mann-Whitney U count with ties scored as incorrect.
     """
-    if pred_col not in df.columns:
+    if pred_col not in view.predictions:
         return 0, 0, 0.0
     
-    likes = df[df['rating'] == 1.0][pred_col].values
-    dislikes = df[df['rating'] == 0.0][pred_col].values
-    
+    preds = view.predictions[pred_col]
+    return _pairwise_counts(preds[view.likes_idx], preds[view.dislikes_idx])
+
+
+def _pairwise_counts(likes: np.ndarray, dislikes: np.ndarray) -> tuple[int, int, float]:
+    """Return (correct_pairs, total_pairs, rate) for liked/disliked prediction arrays."""
     if len(likes) == 0 or len(dislikes) == 0:
         return 0, 0, 0.0
     
-    correct = 0
-    total = 0
-    for like_pred, dislike_pred in product(likes, dislikes):
-        total += 1
-        if like_pred > dislike_pred:
-            correct += 1
+    # For each like, count the dislikes strictly below it in sorted order.
+    # NaN sorts last, so NaN dislikes are never counted; NaN likes are masked.
+    ranks = np.searchsorted(np.sort(dislikes), likes, side='left')
+    correct = int(ranks[~np.isnan(likes)].sum())
+    total = likes.size * dislikes.size
     
     rate = correct / total if total > 0 else 0.0
     return correct, total, rate
 
 
-def rolling_prediction_error(df: pd.DataFrame, pred_col: str, window: int = 10) -> pd.Series:
+def mean_prediction_error(view: FeedbackView, pred_col: str) -> float:
+    """Return mean |prediction - rating|, skipping missing predictions."""
+    error = view.errors[pred_col]
+    error = error[~np.isnan(error)]
+    return float(error.mean(dtype=np.float64)) if error.size else float('nan')
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Return the mean of each window ending at i, over however many samples exist so far."""
+    rolling_mean_stream = _load_kernels().rolling_mean_stream
+    
+    out = np.empty(len(values), dtype=np.float64)
+    rolling_mean_stream(values, window, out)
+    return out
+
+
+def rolling_prediction_error(view: FeedbackView, pred_col: str, window: int = 10) -> pd.Series:
     """Return Series of rolling mean |prediction - rating|."""
-    if pred_col not in df.columns:
-        return pd.Series([0] * len(df))
-    error = (df[pred_col] - df['rating']).abs()
-    return error.rolling(window=window, min_periods=1).mean()
+    if pred_col not in view.predictions:
+        return pd.Series([0] * len(view))
+    return pd.Series(rolling_mean(view.errors[pred_col], window))
+
 
+def cumulative_mean(error: np.ndarray) -> np.ndarray:
+    """Return the all-time mean of error up to each sample, skipping missing values."""
+    valid = ~np.isnan(error)
+    sums = np.cumsum(np.where(valid, error, 0), dtype=np.float64)
+    counts = np.cumsum(valid, dtype=np.float64)
+    return np.divide(sums, counts, out=np.full(len(error), np.nan), where=counts > 0)
 
-def baseline_comparison(df: pd.DataFrame, pred_col: str, n: int = 20) -> dict:
-    """Compare first n vs last n samples."""
-    if len(df) < 2 * n:
-        n = len(df) // 2
+
+def summarize(view: FeedbackView, pred_col: str, n: int = 20) -> dict:
+    """
+    Return like rate and mean error over the first n, last n and all samples.
+    All three spans are accumulated in one pass over the rating and error arrays.
+    """
+    summarize_spans = _load_kernels().summarize_spans
+    
+    if len(view) < 2 * n:
+        n = len(view) // 2
     
-    first = df.head(n)
-    last = df.tail(n)
+    # Fallback: score the ratings themselves, which have zero error
+    error = view.errors.get(pred_col, np.zeros(len(view), dtype=np.float32))
+    likes, error_sums, error_counts = summarize_spans(error, view.ratings, n)
     
-    if pred_col not in df.columns:
-        pred_col = 'rating'  # Fallback
+    summary = {'n': n}
+    for span, (name, total) in enumerate([('first', n), ('last', n), ('total', len(view))]):
+        summary[name] = {
+            'like_rate': (int(likes[span]), total, likes[span] / total if total > 0 else 0.0),
+            'mean_error': error_sums[span] / error_counts[span] if error_counts[span] > 0 else float('nan')
+        }
+    return summary
+
+
+def _span(idx: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Return the entries of a sorted position array that fall in [start, stop)."""
+    return idx[np.searchsorted(idx, start):np.searchsorted(idx, stop)]
+
+
+def baseline_comparison(view: FeedbackView, pred_col: str, n: int = 20, summary: dict | None = None) -> dict:
+    """Compare first n vs last n samples. Pass summary to reuse an existing summarize() result."""
+    if summary is None:
+        summary = summarize(view, pred_col, n)
+    n = summary['n']
+    preds = view.predictions.get(pred_col, view.ratings)  # Fallback
+    
+    def stats(name: str, start: int, stop: int) -> dict:
+        likes = preds[_span(view.likes_idx, start, stop)]
+        dislikes = preds[_span(view.dislikes_idx, start, stop)]
+        return {
+            'like_rate': summary[name]['like_rate'],
+            'pairwise': _pairwise_counts(likes, dislikes),
+            'mean_error': summary[name]['mean_error']
+        }
     
     return {
         'n': n,
-        'first': {
-            'like_rate': like_rate(first),
-            'pairwise': pairwise_agreement(first, pred_col),
-            'mean_error': (first[pred_col] - first['rating']).abs().mean() if pred_col in first.columns else 0
-        },
-        'last': {
-            'like_rate': like_rate(last),
-            'pairwise': pairwise_agreement(last, pred_col),
-            'mean_error': (last[pred_col] - last['rating']).abs().mean() if pred_col in last.columns else 0
-        }
+        'first': stats('first', 0, n),
+        'last': stats('last', len(view) - n, len(view))
     }
 
 
-def plot_rolling_error(df: pd.DataFrame, output_path: Path, pred_cols: list[str], window: int = 10):
+def plot_rolling_error(view: FeedbackView, output_path: Path, pred_cols: list[str], window: int = 10):
     """Generate rolling prediction error chart for all prediction columns."""
-    plt.figure(figsize=(10, 5))
+    fig, ax = _get_axes()
+    step = _chart_step(len(view))
+    x = view.sample_index[::step]
     
-    colors = {'mlpGenomePrediction': '#2563eb', 'mlpAudioPrediction': '#dc2626', 'mlpPrediction': '#2563eb'}
-    labels = {'mlpGenomePrediction': 'Genome MLP', 'mlpAudioPrediction': 'Audio MLP', 'mlpPrediction': 'MLP'}
+    for col in pred_cols:
+        rolling = rolling_prediction_error(view, col, window).to_numpy()[::step]
+        color = _COLORS.get(col, '#2563eb')
+        label = _LABELS.get(col, col)
+        ax.plot(x, rolling, linewidth=2, color=color, label=label)
+        ax.fill_between(x, rolling, alpha=0.2, color=color)
+    
+    ax.set_xlabel('Sample Index', fontsize=12)
+    ax.set_ylabel('Prediction Error', fontsize=12)
+    ax.set_title(f'Rolling Prediction Error (window={window})', fontsize=14)
+    ax.grid(True, alpha=0.3)
+    if len(pred_cols) > 1:
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI, bbox_inches='tight')
+
+
+def plot_cumulative_error(view: FeedbackView, output_path: Path, pred_cols: list[str]):
+    """Generate cumulative mean prediction error chart for all prediction columns."""
+    fig, ax = _get_axes()
+    step = _chart_step(len(view))
+    x = view.sample_index[::step]
     
     for col in pred_cols:
-        rolling = rolling_prediction_error(df, col, window)
-        color = colors.get(col, '#2563eb')
-        label = labels.get(col, col)
-        plt.plot(df['sampleIndex'], rolling, linewidth=2, color=color, label=label)
-        plt.fill_between(df['sampleIndex'], rolling, alpha=0.2, color=color)
-    
-    plt.xlabel('Sample Index', fontsize=12)
-    plt.ylabel('Prediction Error', fontsize=12)
-    plt.title(f'Rolling Prediction Error (window={window})', fontsize=14)
-    plt.grid(True, alpha=0.3)
+        cumulative = cumulative_mean(view.errors[col])[::step]
+        color = _COLORS.get(col, '#2563eb')
+        label = _LABELS.get(col, col)
+        ax.plot(x, cumulative, linewidth=2, color=color, label=label)
+    
+    ax.set_xlabel('Sample Index', fontsize=12)
+    ax.set_ylabel('Mean Absolute Error', fontsize=12)
+    ax.set_title('Cumulative Mean Prediction Error (All-time average)', fontsize=14)
+    ax.grid(True, alpha=0.3)
     if len(pred_cols) > 1:
-        plt.legend()
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI, bbox_inches='tight')
 
 
-def plot_like_rate(df: pd.DataFrame, output_path: Path, window: int = 10):
+def plot_like_rate(view: FeedbackView, output_path: Path, window: int = 10):
     """Generate rolling like rate chart."""
-    rolling = df['rating'].rolling(window=window, min_periods=1).mean()
-    
-    plt.figure(figsize=(10, 5))
-    plt.plot(df['sampleIndex'], rolling, linewidth=2, color='#16a34a')
-    plt.fill_between(df['sampleIndex'], rolling, alpha=0.3, color='#16a34a')
-    plt.axhline(y=0.5, color='#9ca3af', linestyle='--', linewidth=1)
-    plt.xlabel('Sample Index', fontsize=12)
-    plt.ylabel('Like Rate', fontsize=12)
-    plt.title(f'Rolling Like Rate (window={window})', fontsize=14)
-    plt.ylim(0, 1)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
-
-
-def print_summary(df: pd.DataFrame, pred_cols: list[str]):
+    step = _chart_step(len(view))
+    x = view.sample_index[::step]
+    rolling = rolling_mean(view.ratings, window)[::step]
+    
+    fig, ax = _get_axes()
+    ax.plot(x, rolling, linewidth=2, color='#16a34a')
+    ax.fill_between(x, rolling, alpha=0.3, color='#16a34a')
+    ax.axhline(y=0.5, color='#9ca3af', linestyle='--', linewidth=1)
+    ax.set_xlabel('Sample Index', fontsize=12)
+    ax.set_ylabel('Like Rate', fontsize=12)
+    ax.set_title(f'Rolling Like Rate (window={window})', fontsize=14)
+    ax.set_ylim(0, 1)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI, bbox_inches='tight')
+
+
+def print_summary(view: FeedbackView, pred_cols: list[str]):
     """Print formatted metrics summary."""
-    ttfl = time_to_first_like(df)
-    likes, total, lr = like_rate(df)
+    summaries = {col: summarize(view, col) for col in pred_cols}
+    columns = {col: (pairwise_agreement(view, col), summaries[col]['total']['mean_error']) for col in pred_cols}
+    
+    # Baseline comparison for primary prediction column
+    primary_col = pred_cols[0] if pred_cols else 'mlpPrediction'
+    baseline = baseline_comparison(view, primary_col, summary=summaries.get(primary_col))
+    
+    _print_report(like_rate(view), time_to_first_like(view), columns, primary_col, baseline)
+
+
+def _print_report(like_stats: tuple[int, int, float], ttfl: int | None, columns: dict,
+                  primary_col: str, baseline: dict):
+    """Print the metrics summary; columns maps each prediction column to (pairwise, mean_error)."""
+    likes, total, lr = like_stats
     
     print("\nMetrics Summary")
     print("─" * 55)
@@ -186,19 +421,14 @@ def print_summary(df: pd.DataFrame, pred_cols: list[str]):
     print(f"Like Rate:             {lr*100:.1f}% ({likes}/{total})")
     
     # Print metrics for each prediction column
-    for col in pred_cols:
-        label = {'mlpGenomePrediction': 'Genome MLP', 'mlpAudioPrediction': 'Audio MLP', 'mlpPrediction': 'MLP'}.get(col, col)
-        correct, pairs, pa = pairwise_agreement(df, col)
-        mean_err = (df[col] - df['rating']).abs().mean()
+    for col, ((correct, pairs, pa), mean_err) in columns.items():
+        label = _LABELS.get(col, col)
         
         print()
         print(f"[{label}]")
         print(f"  Pairwise Agreement:  {pa*100:.1f}% ({correct}/{pairs} pairs)")
         print(f"  Mean Pred Error:     {mean_err:.3f}")
     
-    # Baseline comparison for primary prediction column
-    primary_col = pred_cols[0] if pred_cols else 'mlpPrediction'
-    baseline = baseline_comparison(df, primary_col)
     n = baseline['n']
     
     print(f"\nBaseline Comparison (First {n} vs Last {n}) [{primary_col}]")
@@ -224,91 +454,244 @@ def print_comparison(df: pd.DataFrame, config1: str, config2: str):
         print("Error: configFlags column not found. Cannot compare configs.")
         return
     
-    df1 = df[df['configFlags'] == config1]
-    df2 = df[df['configFlags'] == config2]
-    pred_cols = get_prediction_columns(df)
+    view1 = FeedbackView.from_frame(df[df['configFlags'] == config1])
+    view2 = FeedbackView.from_frame(df[df['configFlags'] == config2])
+    pred_cols = view1.pred_cols
     
     print(f"\n=== Comparison: {config1} vs {config2} ===")
     print(f"{'':20} {config1:>15} {config2:>15}")
     print("-" * 52)
     
-    print(f"{'Samples':20} {len(df1):>15} {len(df2):>15}")
+    print(f"{'Samples':20} {len(view1):>15} {len(view2):>15}")
     
-    lr1 = like_rate(df1)[2] if len(df1) > 0 else 0
-    lr2 = like_rate(df2)[2] if len(df2) > 0 else 0
+    lr1 = like_rate(view1)[2] if len(view1) > 0 else 0
+    lr2 = like_rate(view2)[2] if len(view2) > 0 else 0
     print(f"{'Like Rate':20} {lr1*100:>14.1f}% {lr2*100:>14.1f}%")
     
     for col in pred_cols:
-        label = {'mlpGenomePrediction': 'Genome', 'mlpAudioPrediction': 'Audio', 'mlpPrediction': 'MLP'}.get(col, col)
+        label = _SHORT_LABELS.get(col, col)
         
-        pa1 = pairwise_agreement(df1, col)[2] if len(df1) > 0 else 0
-        pa2 = pairwise_agreement(df2, col)[2] if len(df2) > 0 else 0
+        pa1 = pairwise_agreement(view1, col)[2] if len(view1) > 0 else 0
+        pa2 = pairwise_agreement(view2, col)[2] if len(view2) > 0 else 0
         print(f"{f'Pairwise ({label})':20} {pa1*100:>14.1f}% {pa2*100:>14.1f}%")
         
-        err1 = (df1[col] - df1['rating']).abs().mean() if len(df1) > 0 and col in df1.columns else 0
-        err2 = (df2[col] - df2['rating']).abs().mean() if len(df2) > 0 and col in df2.columns else 0
+        err1 = mean_prediction_error(view1, col) if len(view1) > 0 and col in view1.predictions else 0
+        err2 = mean_prediction_error(view2, col) if len(view2) > 0 and col in view2.predictions else 0
         print(f"{f'Error ({label})':20} {err1:>15.3f} {err2:>15.3f}")
 
 
-def rolling_pairwise_agreement(df: pd.DataFrame, pred_col: str, window: int = 50) -> pd.Series:
+def rolling_pairwise_agreement(view: FeedbackView, pred_col: str, window: int = 50) -> pd.Series:
     """
     Calculate pairwise agreement over a rolling window.
     Returns a Series where each value corresponds to the window ending at that index.
+    
+    Samples enter and leave the window one at a time, and the correct-pair count is
+    updated from Fenwick trees of likes/dislikes keyed by prediction rank, so the
+    whole series costs O(N log N) instead of re-scoring every window.
     """
-    results = []
+    rolling_u = _load_kernels().rolling_u
     
-    for i in range(len(df)):
-        start = max(0, i - window + 1)
-        # We want the window to end at i
-        subset = df.iloc[start : i+1]
-        
-        # Only compute if we have a reasonable amount of data in the window
-        # mostly to avoid noise at the very start
-        if len(subset) < 5: 
-            results.append(float('nan'))
-            continue
-            
-        _, total, rate = pairwise_agreement(subset, pred_col)
-        
-        if total == 0:
-            results.append(float('nan'))
-        else:
-            results.append(rate)
-            
-    return pd.Series(results, index=df.index)
+    results = np.full(len(view), np.nan)
+    if pred_col not in view.predictions:
+        return pd.Series(results)
+    
+    preds = view.predictions[pred_col]
+    
+    # Dense ranks, so equal predictions share a rank and ties never count as correct.
+    # NaN predictions are counted towards the totals but are never ranked.
+    _, ranks = np.unique(preds, return_inverse=True)
+    ranks = np.where(np.isnan(preds), -1, ranks).astype(np.int64)
+    
+    # Only compute if we have a reasonable amount of data in the window
+    # mostly to avoid noise at the very start
+    rolling_u(ranks, view.ratings, window, 5, results)
+    
+    return pd.Series(results)
 
 
-def plot_rolling_pairwise(df: pd.DataFrame, output_path: Path, pred_cols: list[str], window: int = 50):
+def plot_rolling_pairwise(view: FeedbackView, output_path: Path, pred_cols: list[str], window: int = 50):
     """Generate rolling pairwise agreement chart."""
-    plt.figure(figsize=(10, 5))
-    
-    colors = {'mlpGenomePrediction': '#2563eb', 'mlpAudioPrediction': '#dc2626', 'mlpPrediction': '#2563eb'}
-    labels = {'mlpGenomePrediction': 'Genome MLP', 'mlpAudioPrediction': 'Audio MLP', 'mlpPrediction': 'MLP'}
+    fig, ax = _get_axes()
+    step = _chart_step(len(view))
+    x = view.sample_index[::step]
     
     has_data = False
     for col in pred_cols:
-        rolling = rolling_pairwise_agreement(df, col, window)
+        rolling = rolling_pairwise_agreement(view, col, window)
         # check if not all nan
         if not rolling.dropna().empty:
             has_data = True
-            color = colors.get(col, '#2563eb')
-            label = labels.get(col, col)
-            plt.plot(df['sampleIndex'], rolling, linewidth=2, color=color, label=label)
+            color = _COLORS.get(col, '#2563eb')
+            label = _LABELS.get(col, col)
+            ax.plot(x, rolling.to_numpy()[::step], linewidth=2, color=color, label=label)
     
     if not has_data:
-        plt.close()
         return
 
-    plt.axhline(y=0.5, color='#9ca3af', linestyle='--', linewidth=1, label='Random Guessing')
-    plt.xlabel('Sample Index', fontsize=12)
-    plt.ylabel('Pairwise Agreement', fontsize=12)
-    plt.title(f'Rolling Pairwise Agreement (window={window})', fontsize=14)
-    plt.ylim(0, 1)
-    plt.grid(True, alpha=0.3)
-    plt.legend(loc='lower right')
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    ax.axhline(y=0.5, color='#9ca3af', linestyle='--', linewidth=1, label='Random Guessing')
+    ax.set_xlabel('Sample Index', fontsize=12)
+    ax.set_ylabel('Pairwise Agreement', fontsize=12)
+    ax.set_title(f'Rolling Pairwise Agreement (window={window})', fontsize=14)
+    ax.set_ylim(0, 1)
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc='lower right')
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=CHART_DPI, bbox_inches='tight')
+
+
+def _prediction_keys(preds: np.ndarray) -> np.ndarray:
+    """Return the PREDICTION_BINS bin of each non-NaN prediction."""
+    preds = preds[~np.isnan(preds)].astype(np.float64)
+    return np.rint(preds * (PREDICTION_BINS - 1)).astype(np.int64)
+
+
+def _on_prediction_grid(preds: np.ndarray) -> bool:
+    """
+    Return whether every non-NaN prediction is in [0, 1] and is exactly the float32
+    nearest a multiple of 1e-6, i.e. whether binning ranks them like the floats themselves.
+    """
+    keys = _prediction_keys(preds)
+    if keys.size and (keys.min() < 0 or keys.max() >= PREDICTION_BINS):
+        return False
+    grid = (keys / (PREDICTION_BINS - 1)).astype(preds.dtype)
+    return bool(np.array_equal(grid, preds[~np.isnan(preds)]))
+
+
+def _accumulate_bins(bins: np.ndarray, preds: np.ndarray):
+    """Add predictions to a histogram of PREDICTION_BINS bins over [0, 1], skipping NaN."""
+    bins += np.bincount(_prediction_keys(preds), minlength=len(bins))
+
+
+class StreamingSummary:
+    """
+    Metrics summary accumulated one CSV chunk at a time.
+    
+    Only running counts, per-column prediction histograms and the rows needed for the
+    baseline comparison are kept, so memory stays flat however large the file grows.
+    Chunks must arrive in sampleIndex order with predictions on the 1e-6 grid;
+    is_exact turns False otherwise, as the summary would no longer match print_summary().
+    """
+    
+    def __init__(self, pred_cols: list[str], n: int = 20):
+        self.pred_cols = pred_cols
+        self.n = n
+        self.total = 0
+        self.likes = 0
+        self.dislikes = 0
+        self.first_like = None
+        self.last_index = None
+        self.is_exact = True
+        self.like_bins = {c: np.zeros(PREDICTION_BINS, dtype=np.int64) for c in pred_cols}
+        self.dislike_bins = {c: np.zeros(PREDICTION_BINS, dtype=np.int64) for c in pred_cols}
+        self.error_sums = dict.fromkeys(pred_cols, 0.0)
+        self.error_counts = dict.fromkeys(pred_cols, 0)
+        self.head = None
+        self.tail = None
+    
+    def add(self, chunk: dict[str, np.ndarray]):
+        """Fold one chunk of column arrays into the summary."""
+        if len(chunk['rating']) == 0:
+            return
+        view = FeedbackView(chunk['rating'], chunk['sampleIndex'], {c: chunk[c] for c in self.pred_cols})
+        
+        if np.any(np.diff(view.sample_index) < 0) or (self.last_index is not None and view.sample_index[0] < self.last_index):
+            self.is_exact = False
+        self.last_index = view.sample_index[-1]
+        if not all(_on_prediction_grid(view.predictions[c]) for c in self.pred_cols):
+            self.is_exact = False
+        if not self.is_exact:
+            return
+        
+        if self.first_like is None:
+            self.first_like = time_to_first_like(view)
+        self.total += len(view)
+        self.likes += view.likes_idx.size
+        self.dislikes += view.dislikes_idx.size
+        
+        for col in self.pred_cols:
+            preds = view.predictions[col]
+            _accumulate_bins(self.like_bins[col], preds[view.likes_idx])
+            _accumulate_bins(self.dislike_bins[col], preds[view.dislikes_idx])
+            error = view.errors[col]
+            error = error[~np.isnan(error)]
+            self.error_sums[col] += float(error.sum(dtype=np.float64))
+            self.error_counts[col] += error.size
+        
+        # Keep the first and last n rows for the baseline comparison
+        rows = {'rating': view.ratings, 'sampleIndex': view.sample_index, **view.predictions}
+        if self.head is None:
+            self.head = {c: a[:self.n].copy() for c, a in rows.items()}
+            self.tail = {c: a[-self.n:].copy() for c, a in rows.items()}
+        else:
+            self.head = {c: np.concatenate([self.head[c], a[:self.n]])[:self.n] for c, a in rows.items()}
+            self.tail = {c: np.concatenate([self.tail[c], a[-self.n:]])[-self.n:] for c, a in rows.items()}
+    
+    def print_report(self, pred_cols: list[str]):
+        """Print the same summary print_summary() gives for the whole file."""
+        columns = {}
+        for col in pred_cols:
+            # A like beats every dislike in a strictly lower bin
+            dislikes_below = np.cumsum(self.dislike_bins[col]) - self.dislike_bins[col]
+            correct = int((self.like_bins[col] * dislikes_below).sum())
+            pairs = self.likes * self.dislikes
+            pairwise = (correct, pairs, correct / pairs) if pairs > 0 else (0, 0, 0.0)
+            count = self.error_counts[col]
+            columns[col] = (pairwise, self.error_sums[col] / count if count > 0 else float('nan'))
+        
+        # Rebuild just the first n and last n samples, in order
+        n = min(self.n, self.total // 2)
+        if self.head is None:
+            edges = {c: np.empty(0) for c in ['rating', 'sampleIndex', *self.pred_cols]}
+        else:
+            edges = {c: np.concatenate([self.head[c][:n], self.tail[c][len(self.tail[c]) - n:]]) for c in self.head}
+        view = FeedbackView(edges['rating'], edges['sampleIndex'], {c: edges[c] for c in self.pred_cols})
+        
+        primary_col = pred_cols[0] if pred_cols else 'mlpPrediction'
+        baseline = baseline_comparison(view, primary_col, n)
+        
+        like_stats = (self.likes, self.total, self.likes / self.total if self.total > 0 else 0.0)
+        _print_report(like_stats, self.first_like, columns, primary_col, baseline)
+
+
+def stream_summary(csv_path: Path, config: str | None, input_mode: str) -> bool:
+    """
+    Print the metrics summary by streaming the CSV in chunks.
+    Returns False without printing anything if the file is not in sampleIndex order
+    or has predictions that are not on the 1e-6 grid.
+    """
+    usecols, _ = _read_options(csv_path)
+    missing_config = config is not None and 'configFlags' not in usecols
+    summary = StreamingSummary(get_prediction_columns(usecols))
+    
+    for chunk in iter_chunks(csv_path):
+        if config and not missing_config:
+            selected = chunk['configFlags'] == config
+            chunk = {c: a[selected] for c, a in chunk.items()}
+        summary.add(chunk)
+        if not summary.is_exact:
+            return False
+    
+    if missing_config:
+        print("Warning: configFlags column not found. Showing all data.")
+    elif config:
+        print(f"Filtered to config: {config} ({summary.total} samples)")
+    
+    summary.print_report(select_prediction_columns(summary.pred_cols, input_mode))
+    return True
+
+
+def render_charts(jobs: list[tuple]):
+    """Run (plot_function, *args) jobs, in separate processes when more than one core is available."""
+    workers = min(len(jobs), os.cpu_count() or 1)
+    if workers < 2:
+        for plot, *args in jobs:
+            plot(*args)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(plot, *args) for plot, *args in jobs]
+        for future in futures:
+            future.result()
 
 
 def main():
@@ -328,16 +711,17 @@ def main():
     args = parser.parse_args()
     
     print(f"Loading data from: {args.csv}")
-    df = load_data(args.csv)
-    df = df.sort_values('sampleIndex').reset_index(drop=True)
     
-    pred_cols = get_prediction_columns(df)
+    # Summaries of very large files are streamed so memory stays flat; charts and
+    # --compare need every sample, and files that cannot be streamed exactly
+    # (unsorted, or predictions off the 1e-6 grid) fall back to loading whole
+    if (args.no_charts and not args.compare and args.csv.exists()
+            and args.csv.stat().st_size >= STREAMING_THRESHOLD_BYTES):
+        if stream_summary(args.csv, args.config, args.input_mode):
+            return
     
-    # Filter prediction columns based on --input-mode
-    if args.input_mode == 'genome':
-        pred_cols = [c for c in pred_cols if 'Genome' in c or c == 'mlpPrediction']
-    elif args.input_mode == 'audio':
-        pred_cols = [c for c in pred_cols if 'Audio' in c]
+    df = load_data(args.csv)
+    df = df.sort_values('sampleIndex').reset_index(drop=True)
     
     if args.compare:
         print_comparison(df, args.compare[0], args.compare[1])
@@ -350,7 +734,10 @@ def main():
             df = df[df['configFlags'] == args.config]
             print(f"Filtered to config: {args.config} ({len(df)} samples)")
     
-    print_summary(df, pred_cols)
+    view = FeedbackView.from_frame(df)
+    pred_cols = select_prediction_columns(view.pred_cols, args.input_mode)
+    
+    print_summary(view, pred_cols)
     
     if not args.no_charts:
         suffix = f"_{args.config}" if args.config else ""
@@ -360,10 +747,14 @@ def main():
         
         pairwise_path = args.output / f'rolling_pairwise_agreement{suffix}.png'
         
-        plot_rolling_error(df, error_path, pred_cols)
-        plot_cumulative_error(df, cum_error_path, pred_cols)
-        plot_like_rate(df, rate_path)
-        plot_rolling_pairwise(df, pairwise_path, pred_cols)
+        # The charts are independent, so render them side by side; the view
+        # only holds NumPy arrays and is cheap to send to worker processes
+        render_charts([
+            (plot_rolling_error, view, error_path, pred_cols),
+            (plot_cumulative_error, view, cum_error_path, pred_cols),
+            (plot_like_rate, view, rate_path),
+            (plot_rolling_pairwise, view, pairwise_path, pred_cols),
+        ])
         
         print(f"\nCharts saved to:")
         print(f"  {error_path}")